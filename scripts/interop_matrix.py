@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""Aggregate dora interop test results into a pass/fail matrix.
+
+The interop harness runs a set of external DHCP client scripts against a
+running dora instance and records one JSON result file per backend
+deployment ("standalone" or "nats").  This tool has two subcommands:
+
+    run     execute the client test scripts for one backend and write a
+            per-backend result file
+    report  merge per-backend result files into a combined matrix keyed
+            by (client, protocol) and render terminal/markdown reports,
+            optionally diffed against a previously written combined file
+
+Client test scripts live under a directory laid out as
+``<client>/<v4|v6>/test_<column>_*`` and are expected to exit 0 on pass.
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from functools import lru_cache
+import os
+import re
+import subprocess
+import sys
+import time
+import traceback
+
+try:
+    import orjson
+except ImportError:  # stdlib json still works, just slower
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # streaming parse is optional; only large files want it
+    ijson = None
+
+# inputs above this size are parsed incrementally instead of json.load'ed
+_STREAM_THRESHOLD = 10 * 1024 * 1024
+
+# Columns of the matrix; the leading token of a test name selects its column.
+TEST_COLS = ["discover", "request", "renew", "rebind", "release", "decline"]
+
+COL_W = max(len(c) for c in TEST_COLS) + 2
+PROTO_W = 6
+# column labels padded once so row loops never re-parse a width spec
+_PADDED_COLS = [f"{c:^{COL_W}}" for c in TEST_COLS]
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+C_RESET = "\x1b[0m"
+C_BOLD = "\x1b[1m"
+C_DIM = "\x1b[2m"
+C_GREEN = "\x1b[32m"
+C_RED = "\x1b[31m"
+C_YELLOW = "\x1b[33m"
+C_CYAN = "\x1b[36m"
+C_MAGENTA = "\x1b[35m"
+
+SYM_PASS = C_GREEN + "✓" + C_RESET
+SYM_FAIL = C_RED + "✗" + C_RESET
+SYM_SKIP = C_YELLOW + "s" + C_RESET
+SYM_NA = C_DIM + "·" + C_RESET
+
+_SYM_MAP = {None: SYM_NA, "pass": SYM_PASS, "fail": SYM_FAIL, "skip": SYM_SKIP}
+# plain table derived from the colored one, once, at import time
+_PSYM_MAP = {k: _ANSI_RE.sub("", v) for k, v in _SYM_MAP.items()}
+
+
+def sym(status, plain=False):
+    """Map a test status to its display symbol."""
+    return (_PSYM_MAP if plain else _SYM_MAP).get(status, status)
+
+
+@lru_cache(maxsize=None)
+def col_name(test_name):
+    """Derive the matrix column from a test name, e.g. test_renew_t1 -> renew."""
+    if test_name.startswith("test_"):
+        test_name = test_name.split("test_", 1)[1]
+    return test_name.split("_")[0]
+
+
+def load_json(path):
+    """Load a JSON file, returning None for a missing or unset path."""
+    if not path:
+        return None
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        if ijson is not None and os.fstat(f.fileno()).st_size > _STREAM_THRESHOLD:
+            # top-level values are materialized one at a time rather than
+            # alongside a second full-document copy
+            return dict(ijson.kvitems(f, ""))
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dump_combined(combined, f):
+    """Write the combined report row by row to avoid one large serialize."""
+    f.write('{\n"meta": ')
+    json.dump(combined["meta"], f, indent=2)
+    f.write(',\n"summary": ')
+    json.dump(combined["summary"], f, indent=2)
+    f.write(',\n"rows": [\n')
+    last = len(combined["rows"]) - 1
+    for i, row in enumerate(combined["rows"]):
+        json.dump(row, f)
+        f.write(",\n" if i != last else "\n")
+    f.write("]\n}\n")
+
+
+def iter_client_rows(result_data):
+    """Yield (client, proto, tests) for every row in a per-backend result."""
+    clients = (result_data or {}).get("clients") or {}
+    for cname, protos in sorted(clients.items()):
+        for proto, tests in sorted(protos.items()):
+            yield cname, proto, tests
+
+
+def build_combined(standalone, nats):
+    """Merge per-backend results into one matrix keyed by (client, proto)."""
+    combined = {
+        "meta": {
+            "generated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "backends": [],
+        },
+        "summary": {},
+        "rows": [],
+    }
+    seen = {}
+    for label, data in (("standalone", standalone), ("nats", nats)):
+        if not data:
+            continue
+        combined["meta"]["backends"].append(label)
+        combined["summary"][label] = data.get("summary", {})
+        for cname, proto, tests in iter_client_rows(data):
+            entry = seen.setdefault((cname, proto), {"client": cname, "proto": proto})
+            entry.setdefault(label, {}).update(
+                {col_name(n): t.get("status") for n, t in tests.items()}
+            )
+    combined["rows"] = [seen[k] for k in sorted(seen)]
+    return combined
+
+
+def _index_baseline(baseline):
+    """Index baseline rows by (client, proto) so cell lookups are O(1)."""
+    return {(r["client"], r["proto"]): r for r in baseline.get("rows", [])}
+
+
+def render_terminal(combined, baseline=None):
+    """Render the combined matrix as colored terminal text."""
+    backends = tuple(combined["meta"]["backends"])
+    cols = TEST_COLS
+    baseline_idx = _index_baseline(baseline) if baseline else None
+    name_w = max([len("client")] + [len(r["client"]) for r in combined["rows"]]) + 2
+    col_w = COL_W
+    # resolve every cell status up front so the hot loop only walks lists
+    rendered = [
+        (row, [(b, [row.get(b, {}).get(c) for c in cols]) for b in backends])
+        for row in combined["rows"]
+    ]
+    lines = []
+    lines.append(
+        f"{C_BOLD}dora interop matrix{C_RESET} "
+        f"{C_DIM}generated {combined['meta']['generated']}{C_RESET}"
+    )
+    parts = [f"{'client':<{name_w}}{'proto':<{PROTO_W}}"]
+    for backend in backends:
+        parts.append(f"| {backend:<10}")
+        parts.extend(_PADDED_COLS)
+    header = "".join(parts)
+    lines.append(header)
+    lines.append("-" * len(header))
+    for row, per_backend in rendered:
+        parts = [f"{row['client']:<{name_w}}{row['proto']:<{PROTO_W}}"]
+        baseline_row = (
+            baseline_idx.get((row["client"], row["proto"]))
+            if baseline_idx is not None
+            else None
+        )
+        for backend, statuses in per_backend:
+            parts.append(f"| {'':<10}")
+            if baseline_row is None:
+                # no baseline entry for this row: plain cells, no diff checks
+                for st in statuses:
+                    lpad = (col_w - 1) // 2
+                    parts.append(" " * lpad + sym(st) + " " * (col_w - 1 - lpad))
+                continue
+            old_cols = baseline_row.get(backend, {})
+            for c, st in zip(cols, statuses):
+                cell = sym(st)
+                # visible width, excluding ANSI escapes
+                vis = 1
+                old = old_cols.get(c)
+                if old == "pass" and st == "fail":
+                    cell = C_RED + "!" + C_RESET + cell
+                    vis = 2
+                elif old is not None and old != "pass" and st == "pass":
+                    cell = C_GREEN + "+" + C_RESET + cell
+                    vis = 2
+                lpad = (col_w - vis) // 2
+                parts.append(" " * lpad + cell + " " * (col_w - vis - lpad))
+        lines.append("".join(parts))
+    lines.append("-" * len(header))
+    for backend in backends:
+        summ = combined["summary"].get(backend, {})
+        lines.append(
+            f"{backend}: {summ.get('pass', 0)} pass, "
+            f"{summ.get('fail', 0)} fail, {summ.get('skip', 0)} skip"
+        )
+    return "\n".join(lines)
+
+
+def render_markdown(combined, baseline=None):
+    """Render the combined matrix as a markdown table."""
+    backends = tuple(combined["meta"]["backends"])
+    cols = TEST_COLS
+    baseline_idx = _index_baseline(baseline) if baseline else None
+    rendered = [
+        (row, [(b, [row.get(b, {}).get(c) for c in cols]) for b in backends])
+        for row in combined["rows"]
+    ]
+    lines = [
+        "# dora interop matrix",
+        "",
+        f"generated: {combined['meta']['generated']}",
+        "",
+    ]
+    header = ["| client | proto |"]
+    sep = ["| --- | --- |"]
+    for backend in backends:
+        for c in cols:
+            header.append(f" {backend}.{c} |")
+            sep.append(" :-: |")
+    lines.append("".join(header))
+    lines.append("".join(sep))
+    for row, per_backend in rendered:
+        parts = [f"| {row['client']} | {row['proto']} |"]
+        baseline_row = (
+            baseline_idx.get((row["client"], row["proto"]))
+            if baseline_idx is not None
+            else None
+        )
+        for backend, statuses in per_backend:
+            if baseline_row is None:
+                parts.extend(f" {sym(st, plain=True)} |" for st in statuses)
+                continue
+            old_cols = baseline_row.get(backend, {})
+            for c, st in zip(cols, statuses):
+                cell = sym(st, plain=True)
+                old = old_cols.get(c)
+                if old == "pass" and st == "fail":
+                    cell += " (regression)"
+                elif old is not None and old != "pass" and st == "pass":
+                    cell += " (new)"
+                parts.append(f" {cell} |")
+        lines.append("".join(parts))
+    lines.append("")
+    for backend in backends:
+        summ = combined["summary"].get(backend, {})
+        lines.append(
+            f"- {backend}: {summ.get('pass', 0)} pass, "
+            f"{summ.get('fail', 0)} fail, {summ.get('skip', 0)} skip"
+        )
+    return "\n".join(lines)
+
+
+def render_diff(combined, baseline):
+    """List every cell whose status changed relative to the baseline."""
+    backends = tuple(combined["meta"]["backends"])
+    baseline_idx = _index_baseline(baseline)
+    cols = TEST_COLS
+    lines = []
+    for row in combined["rows"]:
+        baseline_row = baseline_idx.get((row["client"], row["proto"]))
+        get = row.get
+        for backend in backends:
+            old_cols = (baseline_row or {}).get(backend, {})
+            new_cols = get(backend, {})
+            for col in cols:
+                old = old_cols.get(col)
+                new = new_cols.get(col)
+                if old == new:
+                    continue
+                lines.append(
+                    f"{row['client']}/{row['proto']} {backend} {col}: "
+                    f"{old or '-'} {C_MAGENTA}->{C_RESET} {new or '-'}"
+                )
+    if not lines:
+        return f"{C_DIM}no changes against baseline{C_RESET}"
+    return "\n".join(lines)
+
+
+class MatrixResults:
+    """Accumulates per-(client, protocol) test outcomes for one backend run."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.data = {
+            "meta": {
+                "backend": backend,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            },
+            "clients": defaultdict(lambda: defaultdict(dict)),
+            "summary": {},
+        }
+
+    def record(self, client, protocol, test, status, duration=0.0, details=""):
+        # details may be a string or an exc_info tuple from timed_test
+        self.data["clients"][client][protocol][test] = {
+            "status": status,
+            "duration": round(duration, 3),
+            "details": details,
+        }
+
+    def record_skip(self, client, protocol, test, reason=""):
+        self.record(client, protocol, test, "skip", 0.0, reason)
+
+    def _iter_rows(self):
+        for cname, protos in sorted(self.data["clients"].items()):
+            for proto, tests in sorted(protos.items()):
+                yield cname, proto, tests
+
+    def _counts(self):
+        counts = {"pass": 0, "fail": 0, "skip": 0}
+        for _cname, _proto, tests in self._iter_rows():
+            for tval in tests.values():
+                counts[tval["status"]] = counts.get(tval["status"], 0) + 1
+        return counts
+
+    def _finalise(self):
+        # collapse the defaultdicts so the JSON output stays plain dicts
+        self.data["clients"] = {
+            c: dict(protos) for c, protos in self.data["clients"].items()
+        }
+        # deferred tracebacks are only formatted here, at serialization time
+        for _cname, _proto, tests in self._iter_rows():
+            for tval in tests.values():
+                details = tval["details"]
+                if not isinstance(details, str):
+                    tval["details"] = "".join(traceback.format_exception(*details))
+        self.data["summary"] = self._counts()
+        return self.data
+
+    def to_json(self):
+        data = self._finalise()
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        return json.dumps(data, indent=2)
+
+    def write_json(self, path):
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(self._finalise(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w") as f:
+                f.write(self.to_json())
+
+    def print_matrix(self):
+        name_w = max([len("client")] + [len(c) for c in self.data["clients"]]) + 2
+        header = "".join(
+            [f"{'client':<{name_w}}{'proto':<{PROTO_W}}"] + _PADDED_COLS
+        )
+        out = [
+            "",
+            f"{C_BOLD}interop results: {self.backend}{C_RESET}",
+            header,
+            "-" * len(header),
+        ]
+        lpad = (COL_W - 1) // 2
+        for cname, proto, tests in self._iter_rows():
+            statuses = {}
+            for tname, tval in tests.items():
+                statuses[col_name(tname)] = tval["status"]
+            parts = [f"{cname:<{name_w}}{proto:<{PROTO_W}}"]
+            for c in TEST_COLS:
+                parts.append(
+                    " " * lpad + sym(statuses.get(c)) + " " * (COL_W - 1 - lpad)
+                )
+            out.append("".join(parts))
+        out.append("-" * len(header))
+        counts = self._counts()
+        out.append(
+            f"pass {counts['pass']}  fail {counts['fail']}  skip {counts['skip']}"
+        )
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+def timed_test(fn, *args, **kwargs):
+    """Run one test callable, returning (ok, duration, details)."""
+    start = time.perf_counter()
+    try:
+        fn(*args, **kwargs)
+    except Exception:
+        # return the raw exc_info; the traceback is only formatted if the
+        # details actually get serialized
+        return False, time.perf_counter() - start, sys.exc_info()
+    return True, time.perf_counter() - start, ""
+
+
+def run_client_script(path, server, proto):
+    subprocess.run(
+        [path, server, proto],
+        check=True,
+        capture_output=True,
+        timeout=120,
+    )
+
+
+def discover_tests(client_dir):
+    """Yield (client, proto, test_name, path) for every client test script."""
+    for client in sorted(os.listdir(client_dir)):
+        cpath = os.path.join(client_dir, client)
+        if not os.path.isdir(cpath):
+            continue
+        for proto in ("v4", "v6"):
+            ppath = os.path.join(cpath, proto)
+            if not os.path.isdir(ppath):
+                continue
+            for name in sorted(os.listdir(ppath)):
+                if name.startswith("test_"):
+                    yield client, proto, os.path.splitext(name)[0], os.path.join(
+                        ppath, name
+                    )
+
+
+def _disable_color():
+    global _SYM_MAP
+    global C_RESET, C_BOLD, C_DIM, C_GREEN, C_RED, C_YELLOW, C_CYAN, C_MAGENTA
+    C_RESET = C_BOLD = C_DIM = C_GREEN = C_RED = C_YELLOW = C_CYAN = C_MAGENTA = ""
+    # select the pre-stripped table once; render paths never branch on color
+    _SYM_MAP = _PSYM_MAP
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run client test scripts for one backend")
+    run_p.add_argument(
+        "--backend", choices=("standalone", "nats"), default="standalone"
+    )
+    run_p.add_argument("--server", default="127.0.0.1")
+    run_p.add_argument("--client-dir", default="interop/clients")
+    run_p.add_argument("--output", help="write per-backend result JSON here")
+    run_p.add_argument("--no-color", action="store_true")
+
+    rep_p = sub.add_parser("report", help="merge result files and render reports")
+    rep_p.add_argument("--standalone", help="standalone backend result JSON")
+    rep_p.add_argument("--nats", help="nats backend result JSON")
+    rep_p.add_argument("--baseline", help="previously written combined JSON")
+    rep_p.add_argument("--output-json", help="write combined JSON here")
+    rep_p.add_argument("--output-md", help="write markdown report here")
+    rep_p.add_argument("--output-term", help="write plain-text report here")
+    rep_p.add_argument("--no-color", action="store_true")
+
+    args = ap.parse_args(argv)
+    if args.no_color:
+        _disable_color()
+
+    if args.command == "run":
+        results = MatrixResults(args.backend)
+        for client, proto, name, path in discover_tests(args.client_dir):
+            if not os.access(path, os.X_OK):
+                results.record_skip(client, proto, name, "not executable")
+                continue
+            ok, dur, details = timed_test(run_client_script, path, args.server, proto)
+            results.record(
+                client, proto, name, "pass" if ok else "fail", dur, details
+            )
+        results.print_matrix()
+        if args.output:
+            results.write_json(args.output)
+        return 0
+
+    standalone = load_json(args.standalone)
+    nats = load_json(args.nats)
+    if not standalone and not nats:
+        ap.error("report needs at least one of --standalone/--nats")
+    baseline = load_json(args.baseline)
+    combined = build_combined(standalone, nats)
+    term_output = render_terminal(combined, baseline)
+    out = [term_output]
+    if baseline:
+        out.append("")
+        out.append(render_diff(combined, baseline))
+    sys.stdout.write("\n".join(out) + "\n")
+    if args.output_json:
+        if orjson is not None:
+            with open(args.output_json, "wb") as f:
+                f.write(orjson.dumps(combined, option=orjson.OPT_INDENT_2))
+        else:
+            with open(args.output_json, "w") as f:
+                _dump_combined(combined, f)
+    if args.output_md:
+        with open(args.output_md, "w") as f:
+            f.write(render_markdown(combined, baseline) + "\n")
+    if args.output_term:
+        with open(args.output_term, "w") as f:
+            f.write(_ANSI_RE.sub("", term_output) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())